@@ -4,6 +4,7 @@ Jeopardy Gameboard for Discord (Python + Streamlit)
 
 Quick start
 1) Open the terminal and bash:  pip install streamlit==1.39.0
+   Optional (faster save/load of large boards):  pip install orjson msgspec pybase64 xxhash  (or ujson if orjson is unavailable)
 2) Run on the terminal using:      streamlit run jeopardy1.py --server.maxUploadSize=1024
 3) Share your screen in Discord and play!
 
@@ -14,26 +15,84 @@ Features
 - Adjustable point values per question
 - Rename categories, edit questions
 - Mark questions as used; reveal answers
-- Save/Load entire board (JSON with embedded media)
+- Save/Load entire board (zip of board.json + media files; JSON with embedded media also loads)
 - Simple team scoreboard (add teams, adjust points)
 
 Notes
-- This is a single-file app. No database needed. Your board saves to a downloadable JSON file.
-- Media uploaded is embedded (base64) inside the saved JSON so you can share a single file.
+- This is a single-file app. No database needed. Your board saves to a downloadable zip file.
+- Uploaded media is kept in a temporary folder on disk while you play, and stored as raw files
+  inside the saved zip so you can share a single file. The server-side autosave is a JSON
+  file with the media embedded (base64).
 - Works offline once installed.
 """
 
-import base64
+import atexit
+import hashlib
 import io
 import json
+import math
+import mimetypes
+import os
+import shutil
+import tempfile
+import threading
 import uuid
+import zipfile
 import time
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field, fields, is_dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, get_args, get_origin
 
 import streamlit as st
 
+try:
+    import orjson  # optional: much faster JSON encode/decode for media-heavy boards
+except ImportError:
+    orjson = None
+
+try:
+    import ujson  # optional: fallback when orjson can't be installed, still faster than json
+except ImportError:
+    ujson = None
+
+try:
+    import msgspec  # optional: decodes a saved board straight into the dataclasses
+except ImportError:
+    msgspec = None
+
+try:
+    import pybase64 as _b64  # optional: SIMD base64 codec, drop-in for the stdlib module
+except ImportError:
+    import base64 as _b64
+
+try:
+    import xxhash  # optional: faster content hashing of uploaded boards
+except ImportError:
+    xxhash = None
+
 # ----------------------------- Data Models -----------------------------
+def _gen_to_dict(cls):
+    """Attach a generated cls.to_dict() that inlines every field access.
+
+    Fields holding a list of dataclasses recurse through their items' to_dict(); fields marked
+    with metadata {'transient': True} are left out of the saved board.
+    """
+    entries = []
+    for f in fields(cls):
+        if f.metadata.get('transient'):
+            continue
+        args = get_args(f.type)
+        if get_origin(f.type) is list and args and is_dataclass(args[0]):
+            entries.append(f"{f.name!r}: [x.to_dict() for x in self.{f.name}]")
+        else:
+            entries.append(f"{f.name!r}: self.{f.name}")
+    ns: Dict[str, object] = {}
+    exec("def to_dict(self):\n    return {" + ", ".join(entries) + "}\n", ns)
+    cls.to_dict = ns['to_dict']
+    return cls
+
+
+@_gen_to_dict
 @dataclass
 class MediaItem:
     kind: str  # 'image' | 'video' | 'audio'
@@ -42,38 +101,101 @@ class MediaItem:
     mime: Optional[str] = None
     b64: Optional[str] = None  # base64-encoded bytes when source=='upload'
     url: Optional[str] = None  # when source=='url'
+    path: Optional[str] = None  # local file holding the bytes when source=='upload'
 
     def to_display(self) -> Tuple[str, Optional[bytes], Optional[str]]:
-        """Return (kind, bytes_or_None, url_or_None) for display in Streamlit."""
+        """Return (kind, bytes_or_None, url_or_path_or_None) for display in Streamlit."""
+        if self.source == 'upload' and self.path:
+            # Streamlit media elements accept local paths, so no bytes need to pass through here.
+            return self.kind, None, self.path
         if self.source == 'upload' and self.b64:
-            return self.kind, base64.b64decode(self.b64), None
+            # Loaded boards carry media as base64: decode it once, on first display, into a temp
+            # file and serve it from disk like an upload from then on.
+            suffix = Path(self.filename or "").suffix or mimetypes.guess_extension(self.mime or "") or ""
+            with tempfile.NamedTemporaryFile(suffix=suffix, dir=_media_dir(), delete=False) as f:
+                f.write(_b64.b64decode(self.b64))
+            self.path, self.b64 = f.name, None
+            return self.kind, None, self.path
         return self.kind, None, self.url
 
 
+@_gen_to_dict
 @dataclass
 class Question:
     id: str
     points: int
     prompt: str
     answer: str
-    media: List[MediaItem]
+    media: List[MediaItem] = field(default_factory=list)
     timer_seconds: int = 30  # countdown length in seconds (default)
+    # bit in used_mask; per session, not saved
+    idx: int = field(default=-1, repr=False, compare=False, metadata={'transient': True})
 
 
+@_gen_to_dict
 @dataclass
 class Category:
     id: str
     name: str
-    questions: List[Question]
+    questions: List[Question] = field(default_factory=list)
 
 
+@_gen_to_dict
 @dataclass
 class Board:
-    title: str
-    categories: List[Category]
+    title: str = "Jeopardy!"
+    categories: List[Category] = field(default_factory=list)
 
 
 # ----------------------------- Helpers -----------------------------
+_B64_CHUNK = 57 * 1024  # multiple of 3, so no padding is emitted mid-stream
+
+
+def _stream_b64(fileobj) -> str:
+    """Base64-encode a file object in bounded chunks instead of reading it whole."""
+    out = bytearray()
+    while True:
+        chunk = fileobj.read(_B64_CHUNK)
+        if not chunk:
+            break
+        out += _b64.b64encode(chunk)
+    return out.decode('ascii')
+
+
+def _remove_dirs(paths: List[str]):
+    for p in paths:
+        shutil.rmtree(p, ignore_errors=True)
+
+
+@st.cache_resource
+def _media_dirs() -> List[str]:
+    """Process-wide list of the per-session media directories, removed at exit."""
+    paths: List[str] = []
+    atexit.register(_remove_dirs, paths)
+    return paths
+
+
+def _media_dir() -> Path:
+    """This session's temp directory for uploaded media (kept here instead of in session state)."""
+    if '_media_dir' not in st.session_state:
+        st.session_state['_media_dir'] = tempfile.mkdtemp(prefix="jeopardy_media_")
+        _media_dirs().append(st.session_state['_media_dir'])
+    return Path(st.session_state['_media_dir'])
+
+
+def _store_media(fileobj, filename: Optional[str]) -> str:
+    """Copy an uploaded file into this session's media directory and return the new file's path."""
+    out_path = _media_dir() / (uuid.uuid4().hex + Path(filename or "").suffix)
+    with open(out_path, "wb") as out:
+        shutil.copyfileobj(fileobj, out)
+    return str(out_path)
+
+
+def sort_questions(cat: Category):
+    # Keep questions in display order (highest points first) so render_board needn't sort.
+    cat.questions.sort(key=lambda q: q.points, reverse=True)
+
+
 def new_board() -> Board:
     return Board(title="Jeopardy!", categories=[])
 
@@ -81,12 +203,19 @@ def new_board() -> Board:
 def ensure_state():
     if 'board' not in st.session_state:
         st.session_state.board = new_board()
-    if 'used_qids' not in st.session_state:
-        st.session_state.used_qids = set()  # set of question.id
+    if 'board_version' not in st.session_state:
+        st.session_state.board_version = 0  # bumped on every edit to the board
+    if 'used_mask' not in st.session_state:
+        st.session_state.used_mask = 0  # bit q.idx set when question q is used
+        st.session_state.next_qidx = 0
     if 'active_qid' not in st.session_state:
         st.session_state.active_qid = None
     if 'reveal_answer' not in st.session_state:
         st.session_state.reveal_answer = False
+    # running countdown: question id and wall-clock deadline
+    if 'timer_qid' not in st.session_state:
+        st.session_state.timer_qid = None
+        st.session_state.timer_end = 0.0
     if 'scores' not in st.session_state:
         st.session_state.scores = {}  # team_name -> int
     if 'team_colors' not in st.session_state:
@@ -94,20 +223,121 @@ def ensure_state():
     # track last processed upload to avoid re-processing across reruns
     if 'upload_board_last' not in st.session_state:
         st.session_state.upload_board_last = None
+    if '_qid_idx' not in st.session_state:
+        _rebuild_indices(st.session_state.board)
 
 
-def serialize_board(board: Board) -> str:
-    # Convert dataclasses to plain Python dicts first (handles nested dataclasses).
-    return json.dumps(asdict(board), indent=2)
+def bump_board_version():
+    st.session_state.board_version += 1
+
+
+def _rebuild_indices(board: Board):
+    """Rebuild the id -> object lookups; call after categories/questions are added or removed."""
+    # Questions new to this session get the next free bit in used_mask.
+    for c in board.categories:
+        for q in c.questions:
+            if q.idx < 0:
+                q.idx = st.session_state.next_qidx
+                st.session_state.next_qidx += 1
+    st.session_state['_qid_idx'] = {q.id: (c, q) for c in board.categories for q in c.questions}
+    st.session_state['_cid_idx'] = {c.id: c for c in board.categories}
+
 
+def _dumps(obj) -> str:
+    # Compact output: indentation only adds bytes around the (large) media strings.
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    if ujson is not None:
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
 
-def deserialize_board(s: str) -> Board:
-    raw = json.loads(s)
 
+def _loads(s: str):
+    if orjson is not None:
+        return orjson.loads(s)
+    if ujson is not None:
+        return ujson.loads(s)
+    return json.loads(s)
+
+
+def serialize_board(board: Board) -> str:
+    # Build plain dicts by direct field access (asdict() would deep-copy every base64 payload).
+    raw = board.to_dict()
+    # Local media paths are not portable: embed the file contents only now, at export time.
+    for c in raw['categories']:
+        for q in c['questions']:
+            for m in q['media']:
+                path = m.pop('path', None)
+                if path:
+                    with open(path, "rb") as f:
+                        m['b64'] = _stream_b64(f)
+    return _dumps(raw)
+
+
+def serialize_board_zip(board: Board) -> bytes:
+    """Pack board.json plus each media file as its own raw entry (no base64 on the way out)."""
+    raw = board.to_dict()
+    buf = io.BytesIO()
+    # Media is already compressed (png/mp4/mp3...), so store entries instead of deflating them.
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+        for c in raw['categories']:
+            for q in c['questions']:
+                for m in q['media']:
+                    path, b64 = m.pop('path', None), m.pop('b64', None)
+                    if not (path or b64):
+                        continue
+                    # board.json refers to the media by its name inside the archive
+                    m['path'] = f"media/{uuid.uuid4().hex}{Path(path or m['filename'] or '').suffix}"
+                    if path:
+                        zf.write(path, m['path'])
+                    else:
+                        # loaded from JSON and not displayed yet, so still embedded
+                        zf.writestr(m['path'], _b64.b64decode(b64))
+        zf.writestr("board.json", _dumps(raw))
+    return buf.getvalue()
+
+
+def deserialize_board(s: str, media_zip: Optional[zipfile.ZipFile] = None) -> Board:
+    """Parse a saved board; media_zip is the archive its media paths refer to, if any."""
+    return _resolve_media(_decode_board(s), media_zip)
+
+
+def _decode_board(s: str) -> Board:
+    """Decode a saved board without touching disk; media paths are still unresolved names."""
+    if msgspec is not None:
+        # Builds the whole Board/Category/Question/MediaItem tree in one pass from the
+        # type hints; strict=False keeps accepting numbers saved as strings.
+        board = msgspec.json.decode(s, type=Board, strict=False)
+    else:
+        board = _board_from_raw(_loads(s))
+    # Embedded media stays base64 here; MediaItem.to_display decodes it only when shown.
+    for c in board.categories:
+        sort_questions(c)
+        for q in c.questions:
+            # used_mask bits are handed out per session by _rebuild_indices, never read from a file
+            q.idx = -1
+    return board
+
+
+def _resolve_media(board: Board, media_zip: Optional[zipfile.ZipFile]) -> Board:
+    """Turn the media paths of a freshly decoded board into files in this session's media dir."""
+    for c in board.categories:
+        for q in c.questions:
+            for m in q.media:
+                # A path read from a file is never trusted as a local file: both decoders may
+                # fill it in, so clear it first. It can only name an entry inside media_zip.
+                ref, m.path = m.path, None
+                if ref and media_zip is not None:
+                    with media_zip.open(ref) as src:
+                        m.path = _store_media(src, ref)
+    return board
+
+
+def _board_from_raw(raw: dict) -> Board:
     def to_media(m):
         return MediaItem(
             kind=m['kind'], source=m['source'], filename=m.get('filename'),
-            mime=m.get('mime'), b64=m.get('b64'), url=m.get('url')
+            mime=m.get('mime'), b64=m.get('b64'), url=m.get('url'), path=m.get('path')
         )
 
     def to_q(q):
@@ -123,19 +353,71 @@ def deserialize_board(s: str) -> Board:
     return Board(title=raw.get('title', 'Jeopardy!'), categories=[to_cat(c) for c in raw.get('categories', [])])
 
 
+def _write_atomic(text: str, path: Path):
+    """Write text to a temp file next to path, then swap it in so readers never see a partial file."""
+    f = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False)
+    try:
+        with f:
+            f.write(text)
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.remove(f.name)
+        except OSError:
+            pass
+        raise
+
+
+@st.cache_resource
+def _autosave_lock() -> threading.Lock:
+    """One lock for the whole process, so writes to the autosave file never overlap."""
+    return threading.Lock()
+
+
+def _autosave_worker(text: str, path: Path, version: int, status: dict, lock: threading.Lock):
+    """Background autosave; skipped if a newer board version was already written."""
+    with lock:
+        if version <= status['saved_version']:
+            return
+        try:
+            _write_atomic(text, path)
+        except Exception as e:
+            # picked up and shown by sidebar_editor on the next rerun
+            status['error'] = str(e)
+        else:
+            status['saved_version'] = version
+            status['error'] = None
+
+
+def _content_id(data: bytes) -> str:
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+@st.cache_data(max_entries=8, ttl=3600, show_spinner=False)
+def _parse_board_zip(upload_id: str, _board_json: str) -> Board:
+    # Keyed on the hash of the whole zip; the leading underscore keeps Streamlit from re-hashing
+    # _board_json. Only the small decoded tree is cached (shared by all sessions), never media.
+    return _decode_board(_board_json)
+
+
+def _load_board(upload_id: str, data: bytes) -> Board:
+    """Parse an uploaded board, copying its media into this session's media directory."""
+    if not zipfile.is_zipfile(io.BytesIO(data)):
+        # JSON boards embed their media as base64; parse them directly instead of caching them
+        return deserialize_board(data.decode("utf-8"))
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        board = _parse_board_zip(upload_id, zf.read("board.json").decode("utf-8"))
+        return _resolve_media(board, zf)
+
+
 def find_question(board: Board, qid: str) -> Optional[Tuple[Category, Question]]:
-    for cat in board.categories:
-        for q in cat.questions:
-            if q.id == qid:
-                return cat, q
-    return None
+    return st.session_state['_qid_idx'].get(qid)
 
 
 def category_by_id(board: Board, cid: str) -> Optional[Category]:
-    for c in board.categories:
-        if c.id == cid:
-            return c
-    return None
+    return st.session_state['_cid_idx'].get(cid)
 
 
 # ----------------------------- UI: Sidebar (Editor & Save/Load) -----------------------------
@@ -146,7 +428,10 @@ def sidebar_editor(board: Board):
     # Board title
     st.sidebar.text_input("Game Title", value=board.title, key="board_title_input")
     # keep board.title in sync with the text input (use get so first run is safe)
-    board.title = st.session_state.get("board_title_input", board.title)
+    new_title = st.session_state.get("board_title_input", board.title)
+    if new_title != board.title:
+        board.title = new_title
+        bump_board_version()
 
     with st.sidebar.expander("Categories", expanded=True):
         # Add category
@@ -158,6 +443,8 @@ def sidebar_editor(board: Board):
             name = st.session_state.get("new_cat_name", "").strip()
             if name:
                 b.categories.append(Category(id=str(uuid.uuid4()), name=name, questions=[]))
+                _rebuild_indices(b)
+                bump_board_version()
                 st.session_state["new_cat_name"] = ""
             # st.rerun() removed — Streamlit will rerun after the callback finishes.
 
@@ -175,13 +462,17 @@ def sidebar_editor(board: Board):
                 c1, c2 = st.columns([0.7, 0.3])
                 with c1:
                     new_name = st.text_input(f"Rename '{cat.name}'", value=cat.name, key=f"rename_{cat.id}")
-                    cat.name = new_name
+                    if new_name != cat.name:
+                        cat.name = new_name
+                        bump_board_version()
                 with c2:
                     if st.button("Remove", key=f"rm_{cat.id}"):
                         # Remove category and any active/used references
-                        st.session_state.used_qids = {qid for qid in st.session_state.used_qids
-                                                      if find_question(board, qid) is not None}
                         board.categories = [c for c in board.categories if c.id != cat.id]
+                        _rebuild_indices(board)
+                        bump_board_version()
+                        for qq in cat.questions:
+                            st.session_state.used_mask &= ~(1 << qq.idx)
                         st.rerun()
 
     with st.sidebar.expander("Add Question", expanded=True):
@@ -213,19 +504,19 @@ def sidebar_editor(board: Board):
                 for f in img_files or []:
                     media.append(MediaItem(
                         kind='image', source='upload', filename=f.name, mime=f.type,
-                        b64=base64.b64encode(f.read()).decode('utf-8')
+                        path=_store_media(f, f.name)
                     ))
                 # Uploaded video
                 if vid_file is not None:
                     media.append(MediaItem(
                         kind='video', source='upload', filename=vid_file.name, mime=vid_file.type,
-                        b64=base64.b64encode(vid_file.read()).decode('utf-8')
+                        path=_store_media(vid_file, vid_file.name)
                     ))
                 # Uploaded audio
                 if aud_file is not None:
                     media.append(MediaItem(
                         kind='audio', source='upload', filename=aud_file.name, mime=aud_file.type,
-                        b64=base64.b64encode(aud_file.read()).decode('utf-8')
+                        path=_store_media(aud_file, aud_file.name)
                     ))
                 # URLs
                 if img_url.strip():
@@ -237,7 +528,11 @@ def sidebar_editor(board: Board):
 
                 q = Question(id=str(uuid.uuid4()), points=int(points), prompt=prompt, answer=answer, media=media,
                              timer_seconds=int(timer_for_new))
-                category_by_id(board, chosen_cid).questions.append(q)
+                chosen_cat = category_by_id(board, chosen_cid)
+                chosen_cat.questions.append(q)
+                sort_questions(chosen_cat)
+                _rebuild_indices(board)
+                bump_board_version()
                 st.success("Question added!")
         else:
             st.info("Create a category first.")
@@ -261,14 +556,18 @@ def sidebar_editor(board: Board):
 
                 if st.button("Apply Changes"):
                     q.points = int(new_points)
+                    sort_questions(cat)
                     q.prompt = new_prompt
                     q.answer = new_answer
                     q.timer_seconds = int(new_timer)
+                    bump_board_version()
                     st.success("Updated.")
 
             if st.button("Delete Question", type="secondary", key=f"delete_q_{q.id}"):
                 cat.questions = [qq for qq in cat.questions if qq.id != q.id]
-                st.session_state.used_qids.discard(q.id)
+                _rebuild_indices(board)
+                bump_board_version()
+                st.session_state.used_mask &= ~(1 << q.idx)
                 st.success("Deleted.")
                 st.rerun()
         else:
@@ -276,33 +575,38 @@ def sidebar_editor(board: Board):
 
     with st.sidebar.expander("Save / Load Board", expanded=False):
         st.write("Save your board to a file (download) or load a saved board.")
-        # Download current board as JSON
-        try:
-            json_str = serialize_board(board)
-        except Exception as e:
-            json_str = ""
-            st.error(f"Serialization error: {e}")
-
-        st.download_button(
-            "Download board (.json)",
-            data=json_str,
-            file_name="jeopardy_board.json",
-            mime="application/json",
-            key="download_board_btn",
-        )
+        # Build the zip only when asked for: it re-reads every media file, and the bytes are
+        # handed straight to the download button instead of being kept in session state.
+        if st.button("Prepare download (.zip)", key="prepare_download_btn"):
+            try:
+                st.download_button(
+                    "Download board (.zip)",
+                    data=serialize_board_zip(board),
+                    file_name="jeopardy_board.zip",
+                    mime="application/zip",
+                    key="download_board_btn",
+                )
+            except Exception as e:
+                st.error(f"Serialization error: {e}")
 
-        # Upload a board JSON to load
-        uploaded = st.file_uploader("Load board (.json)", type=["json"], key="upload_board")
+        # Upload a saved board to load (zip, or older JSON with embedded media)
+        uploaded = st.file_uploader("Load board (.zip or .json)", type=["zip", "json"], key="upload_board")
         if uploaded is not None:
             try:
-                # Create a small stable id for this upload (name + size)
-                bytes_data = uploaded.read()
-                upload_id = f"{getattr(uploaded,'name', '')}:{len(bytes_data)}"
+                # Identify this upload by a hash of its contents
+                bytes_data = uploaded.getvalue()
+                upload_id = _content_id(bytes_data)
                 # Only process if we haven't already processed this exact upload
                 if st.session_state.get("upload_board_last") != upload_id:
-                    s = bytes_data.decode("utf-8") if isinstance(bytes_data, (bytes, bytearray)) else str(bytes_data)
-                    newb = deserialize_board(s)
+                    newb = _load_board(upload_id, bytes_data)
                     st.session_state["board"] = newb
+                    # the save/autosave code below must see the loaded board, not the old one
+                    board = newb
+                    # fresh board: renumber its questions and forget what was used on the old one
+                    st.session_state.used_mask = 0
+                    st.session_state.next_qidx = 0
+                    _rebuild_indices(newb)
+                    bump_board_version()
                     st.session_state["upload_board_last"] = upload_id
                     st.success("Board loaded.")
                 # Do NOT call st.rerun() here — avoids infinite rerun loop while the uploader still holds the file.
@@ -314,26 +618,37 @@ def sidebar_editor(board: Board):
         autosave = st.checkbox("Autosave board to disk (jeopardy_board_autosave.json)", value=autosave_default, key="autosave_toggle")
         st.session_state["autosave_to_disk"] = autosave
 
+        # newest board version written to the autosave file, and the last background write error
+        status = st.session_state.setdefault("autosave_status", {'saved_version': -1, 'error': None})
+        out_path = Path.cwd() / "jeopardy_board_autosave.json"
+
         if st.button("Save board to server file (jeopardy_board_autosave.json)", key="save_to_disk_btn"):
             try:
-                from pathlib import Path
-                out_path = Path.cwd() / "jeopardy_board_autosave.json"
-                with open(out_path, "w", encoding="utf-8") as f:
-                    f.write(serialize_board(board))
+                with _autosave_lock():
+                    _write_atomic(serialize_board(board), out_path)
+                    status['saved_version'] = max(status['saved_version'], st.session_state.board_version)
                 st.success(f"Saved board to {out_path}")
             except Exception as e:
                 st.error(f"Failed to write file: {e}")
 
-        # Perform an immediate autosave when toggle enabled
-        if autosave:
-            try:
-                from pathlib import Path
-                out_path = Path.cwd() / "jeopardy_board_autosave.json"
-                with open(out_path, "w", encoding="utf-8") as f:
-                    f.write(serialize_board(board))
+        # Autosave when toggle enabled, but only if the board changed since the last write;
+        # the file itself is written on a background thread so the UI doesn't wait on disk.
+        if not autosave:
+            st.session_state["autosave_last_version"] = None
+        else:
+            version = st.session_state.board_version
+            if st.session_state.get("autosave_last_version") != version:
+                try:
+                    json_str = serialize_board(board)
+                    threading.Thread(target=_autosave_worker, daemon=True,
+                                     args=(json_str, out_path, version, status, _autosave_lock())).start()
+                    st.session_state["autosave_last_version"] = version
+                except Exception as e:
+                    st.error(f"Autosave failed: {e}")
+            if status['error']:
+                st.error(f"Autosave failed: {status['error']}")
+            elif status['saved_version'] == version:
                 st.info(f"Autosaved to {out_path}")
-            except Exception as e:
-                st.error(f"Autosave failed: {e}")
 
 
 # ----------------------------- Score helpers & UI -----------------------------
@@ -422,6 +737,22 @@ def render_scoreboard_main():
 
 # ----------------------------- UI: Gameboard -----------------------------
 
+@st.fragment(run_every=1)
+def _countdown(q: Question):
+    """Redraw the remaining time once a second without blocking the script thread."""
+    remaining = max(0, math.ceil(st.session_state.timer_end - time.time()))
+    mins, secs = divmod(remaining, 60)
+    st.markdown(f"### Time remaining: {mins:02d}:{secs:02d}")
+    if remaining == 0:
+        # time's up -> mark used and close viewer
+        st.session_state.used_mask |= 1 << q.idx
+        st.session_state.active_qid = None
+        st.session_state.reveal_answer = False
+        st.session_state.timer_qid = None
+        st.session_state.timer_expired = True
+        st.rerun()
+
+
 def render_board(board: Board):
     # Inject updated CSS for larger boxed title, slightly bigger category headers,
     # and more spacing between categories / question buttons
@@ -464,11 +795,6 @@ def render_board(board: Board):
             margin: 8px 12px; /* gives extra gap between category columns/buttons */
         }
 
-        /* Ensure the row spacing between category header and first button is a bit larger */
-        .jeopardy-column-gap {
-            margin-bottom: 18px;
-        }
-
         /* Slight tweak for the centered scoreboard area */
         .score-card { display:flex; align-items:center; justify-content:space-between;
                       background: rgba(255,255,255,0.02); padding:12px; margin:12px 0; border-radius:8px; }
@@ -487,35 +813,35 @@ def render_board(board: Board):
     # Render the board centered in the page (spacers left/right)
     left, center, right = st.columns([1, 6, 1])
     with center:
-        # Header row: category names
+        # Header row: category names. Kept in its own row so a name that wraps onto more lines
+        # doesn't push that category's buttons out of line with the others.
         cat_cols = st.columns(len(board.categories))
-        for i, cat in enumerate(board.categories):
-            with cat_cols[i]:
+        for cat, col in zip(board.categories, cat_cols):
+            with col:
                 st.markdown(f"<div class='jeopardy-category'>{cat.name}</div>", unsafe_allow_html=True)
 
-        # Sort questions within each category by points (descending typical Jeopardy style)
-        sorted_qs = [sorted(c.questions, key=lambda q: q.points, reverse=True) for c in board.categories]
-
-        # Render grid of buttons (larger, centered) with a small extra gap row class around them
-        for row in range(max((len(qs) for qs in sorted_qs), default=0)):
-            row_cols = st.columns(len(board.categories))
-            for c_idx, qs in enumerate(sorted_qs):
-                with row_cols[c_idx]:
-                    st.markdown("<div class='jeopardy-column-gap'>", unsafe_allow_html=True)
-                    if row < len(qs):
-                        q = qs[row]
-                        used = q.id in st.session_state.used_qids
-                        label = f"{q.points}"
-                        # make buttons fill their column (use_container_width still helpful)
-                        if used:
-                            st.button(label, key=f"used_{q.id}", disabled=True, use_container_width=True)
-                        else:
-                            if st.button(label, key=f"btn_{q.id}", use_container_width=True):
-                                st.session_state.active_qid = q.id
-                                st.session_state.reveal_answer = False
+        # Buttons: one column per category filled top to bottom, so the whole grid costs a
+        # second st.columns call instead of one per row.
+        btn_cols = st.columns(len(board.categories))
+        used_mask = st.session_state.used_mask
+
+        for cat, col in zip(board.categories, btn_cols):
+            with col:
+                # Questions are kept sorted by points (descending typical Jeopardy style)
+                for q in cat.questions:
+                    used = used_mask & (1 << q.idx)
+                    label = f"{q.points}"
+                    # make buttons fill their column (use_container_width still helpful)
+                    if used:
+                        st.button(label, key=f"used_{q.id}", disabled=True, use_container_width=True)
                     else:
-                        st.write("")
-                    st.markdown("</div>", unsafe_allow_html=True)
+                        if st.button(label, key=f"btn_{q.id}", use_container_width=True):
+                            st.session_state.active_qid = q.id
+                            st.session_state.reveal_answer = False
+                            st.session_state.timer_qid = None
+
+    if st.session_state.pop('timer_expired', False):
+        st.success("Time's up — question marked used.")
 
     # Active question viewer (unchanged, but keep centered by using main area)
     if st.session_state.active_qid:
@@ -532,23 +858,15 @@ def render_board(board: Board):
                 timer_val = st.number_input("Timer (seconds)", min_value=5, max_value=600, value=q.timer_seconds, key=f"timer_setting_{q.id}")
             with tcol2:
                 start_pressed = st.button("Start Timer", key=f"start_timer_{q.id}")
-            # placeholder for countdown display
-            timer_ph = st.empty()
             if start_pressed:
                 # store chosen timer to the question (so it serializes if saved later)
-                q.timer_seconds = int(timer_val)
-                # blocking countdown loop (updates the placeholder each second)
-                for remaining in range(q.timer_seconds, -1, -1):
-                    mins, secs = divmod(remaining, 60)
-                    timer_ph.markdown(f"### Time remaining: {mins:02d}:{secs:02d}")
-                    time.sleep(1)
-                # time's up -> mark used and close viewer
-                st.session_state.used_qids.add(q.id)
-                st.session_state.active_qid = None
-                st.session_state.reveal_answer = False
-                st.success("Time's up — question marked used.")
-                # short pause so user sees the success message
-                time.sleep(0.5)
+                if int(timer_val) != q.timer_seconds:
+                    q.timer_seconds = int(timer_val)
+                    bump_board_version()
+                st.session_state.timer_qid = q.id
+                st.session_state.timer_end = time.time() + q.timer_seconds
+            if st.session_state.timer_qid == q.id:
+                _countdown(q)
 
             # Media display
             if q.media:
@@ -559,17 +877,17 @@ def render_board(board: Board):
                         if data_bytes is not None:
                             st.image(data_bytes, caption=m.filename or f"Image {idx}")
                         elif url:
-                            st.image(url, caption=url)
+                            st.image(url, caption=m.filename or url)
                     elif kind == 'video':
                         if data_bytes is not None:
                             st.video(data_bytes)
                         elif url:
-                            st.video(url)
+                            st.video(url, format=m.mime or 'video/mp4')
                     elif kind == 'audio':
                         if data_bytes is not None:
                             st.audio(data_bytes, format=m.mime or 'audio/mpeg')
                         elif url:
-                            st.audio(url)
+                            st.audio(url, format=m.mime or 'audio/mpeg')
 
             # Reveal answer controls
             cols = st.columns([0.25, 0.25, 0.25, 0.25])
@@ -581,7 +899,7 @@ def render_board(board: Board):
                     st.session_state.reveal_answer = False
             with cols[2]:
                 if st.button("Mark Used", key=f"mark_used_{q.id}"):
-                    st.session_state.used_qids.add(q.id)
+                    st.session_state.used_mask |= 1 << q.idx
                     st.session_state.active_qid = None
                     st.session_state.reveal_answer = False
             with cols[3]:
@@ -600,7 +918,7 @@ def render_board(board: Board):
         btn_cols = st.columns([0.5, 0.5])
         with btn_cols[0]:
             if st.button("Reset Used Questions", key="reset_used_btn", use_container_width=True):
-                st.session_state.used_qids = set()
+                st.session_state.used_mask = 0
                 st.session_state.active_qid = None
                 st.session_state.reveal_answer = False
         with btn_cols[1]: